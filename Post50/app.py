@@ -1,15 +1,25 @@
+import hashlib
+import io
 import os
 import re
 import secrets
+import sqlite3
 import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, abort
+import orjson
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, abort, current_app, make_response
+from flask.json.provider import JSONProvider
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import defer, selectinload
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user, UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 from PIL import Image
+from cachetools import TTLCache
 
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -25,12 +35,47 @@ login_manager = LoginManager()
 login_manager.login_view = 'login'
 
 
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune every SQLite connection: WAL lets readers run alongside the writer,
+    NORMAL sync drops a redundant fsync per commit, and the rest trade a bit of
+    memory for fewer disk reads."""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA mmap_size=268435456')
+    cursor.execute('PRAGMA cache_size=-65536')
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.execute('PRAGMA busy_timeout=5000')
+    cursor.close()
+
+
+class OrjsonProvider(JSONProvider):
+    """orjson-backed JSON for all jsonify responses; it serializes datetimes
+    natively as ISO 8601 with a Z suffix (naive values treated as UTC)."""
+
+    _options = orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=self._options).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 def create_app():
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-' + secrets.token_hex(16))
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + str(BASE_DIR / 'post50.db')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB uploads
+    # scrypt is faster than the pbkdf2 default at the same security level;
+    # tests can override with e.g. 'pbkdf2:sha256:1' to keep signups cheap
+    app.config['PASSWORD_HASH_METHOD'] = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
 
     app.config['UPLOAD_FOLDER_AVATARS'] = str(UPLOAD_FOLDER_AVATARS)
     app.config['UPLOAD_FOLDER_POSTS'] = str(UPLOAD_FOLDER_POSTS)
@@ -40,11 +85,42 @@ def create_app():
 
     with app.app_context():
         db.create_all()
+        apply_migrations()
 
     register_routes(app)
     return app
 
 
+def apply_migrations():
+    """Bring a pre-existing SQLite database up to date with the current models."""
+    post_columns = {row[1] for row in db.session.execute(db.text('PRAGMA table_info(post)'))}
+    if 'content_hash' not in post_columns:
+        db.session.execute(db.text('ALTER TABLE post ADD COLUMN content_hash VARCHAR(32)'))
+    if 'score' not in post_columns:
+        db.session.execute(db.text('ALTER TABLE post ADD COLUMN score INTEGER NOT NULL DEFAULT 0'))
+        db.session.execute(db.text(
+            'UPDATE post SET score = COALESCE('
+            '(SELECT SUM(value) FROM vote WHERE vote.post_id = post.id), 0)'
+        ))
+    db.session.execute(db.text('CREATE INDEX IF NOT EXISTS ix_post_score ON post (score)'))
+    db.session.execute(db.text('CREATE INDEX IF NOT EXISTS ix_post_author_created ON post (author_id, created_at)'))
+    db.session.execute(db.text('CREATE INDEX IF NOT EXISTS ix_vote_post_value ON vote (post_id, value)'))
+    db.session.execute(db.text(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS post_fts "
+        "USING fts5(title, content, username, tags, tokenize='porter unicode61')"
+    ))
+    # Backfill the search index for databases created before FTS existed
+    if db.session.execute(db.text('SELECT count(*) FROM post_fts')).scalar() == 0:
+        db.session.execute(db.text(
+            'INSERT INTO post_fts(rowid, title, content, username, tags) '
+            'SELECT post.id, post.title, post.content, user.username, '
+            "COALESCE((SELECT group_concat(tag.name, ' ') FROM post_tags "
+            'JOIN tag ON tag.id = post_tags.tag_id WHERE post_tags.post_id = post.id), \'\') '
+            'FROM post JOIN user ON user.id = post.author_id'
+        ))
+    db.session.commit()
+
+
 # Models
 class User(db.Model, UserMixin):
     id = db.Column(db.Integer, primary_key=True)
@@ -60,7 +136,8 @@ class User(db.Model, UserMixin):
     votes = db.relationship('Vote', backref='voter', lazy=True)
 
     def set_password(self, password: str):
-        self.password_hash = generate_password_hash(password)
+        method = current_app.config.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+        self.password_hash = generate_password_hash(password, method=method)
 
     def check_password(self, password: str) -> bool:
         return check_password_hash(self.password_hash, password)
@@ -80,16 +157,16 @@ class Post(db.Model):
     image_path = db.Column(db.String(255))  # optional featured image
     created_at = db.Column(db.DateTime, default=dt.datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=dt.datetime.utcnow, onupdate=dt.datetime.utcnow)
+    score = db.Column(db.Integer, default=0, nullable=False, index=True)  # denormalized sum of vote values
+    content_hash = db.Column(db.String(32))  # hash of the tag-bearing fields, to skip tag rebuilds on edit
 
     author_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
-    tags = db.relationship('Tag', secondary=post_tags, lazy='subquery', backref=db.backref('posts', lazy=True))
+    tags = db.relationship('Tag', secondary=post_tags, lazy='select', backref=db.backref('posts', lazy=True))
     comments = db.relationship('Comment', backref='post', lazy=True, cascade='all, delete-orphan')
     votes = db.relationship('Vote', backref='post', lazy=True, cascade='all, delete-orphan')
 
-    @property
-    def score(self) -> int:
-        return sum(v.value for v in self.votes) if self.votes else 0
+    __table_args__ = (db.Index('ix_post_author_created', 'author_id', 'created_at'),)
 
 
 class Tag(db.Model):
@@ -113,7 +190,76 @@ class Vote(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     post_id = db.Column(db.Integer, db.ForeignKey('post.id'), nullable=False)
 
-    __table_args__ = (db.UniqueConstraint('user_id', 'post_id', name='unique_user_post_vote'),)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'post_id', name='unique_user_post_vote'),
+        db.Index('ix_vote_post_value', 'post_id', 'value'),
+    )
+
+
+# Full-text search index maintenance: keep post_fts mirroring Post rows
+def _fts_insert(connection, post: 'Post'):
+    username = connection.execute(
+        db.text('SELECT username FROM user WHERE id = :id'), {'id': post.author_id}
+    ).scalar() or ''
+    connection.execute(
+        db.text('INSERT INTO post_fts(rowid, title, content, username, tags) '
+                'VALUES (:id, :title, :content, :username, :tags)'),
+        {'id': post.id, 'title': post.title, 'content': post.content,
+         'username': username, 'tags': ' '.join(t.name for t in post.tags)},
+    )
+
+
+@event.listens_for(Post, 'after_insert')
+def _fts_after_insert(mapper, connection, post):
+    _fts_insert(connection, post)
+
+
+@event.listens_for(Post, 'after_update')
+def _fts_after_update(mapper, connection, post):
+    connection.execute(db.text('DELETE FROM post_fts WHERE rowid = :id'), {'id': post.id})
+    _fts_insert(connection, post)
+
+
+@event.listens_for(Post, 'after_delete')
+def _fts_after_delete(mapper, connection, post):
+    connection.execute(db.text('DELETE FROM post_fts WHERE rowid = :id'), {'id': post.id})
+
+
+def fts_match_query(q: str) -> str:
+    """Quote each search term so user input can't break FTS5 query syntax."""
+    return ' '.join('"' + term.replace('"', '') + '"' for term in q.split())
+
+
+def search_post_ids(q: str, limit: int, offset: int) -> list[int]:
+    """Return post ids matching q, best BM25 rank first."""
+    match = fts_match_query(q)
+    if not match:
+        return []
+    rows = db.session.execute(
+        db.text('SELECT rowid FROM post_fts WHERE post_fts MATCH :q '
+                'ORDER BY rank LIMIT :limit OFFSET :offset'),
+        {'q': match, 'limit': limit, 'offset': offset},
+    )
+    return [row[0] for row in rows]
+
+
+def feed_etag() -> str:
+    """Weak fingerprint of everything the post feed renders from.
+
+    Three tiny aggregate queries stand in for the full query-render-serialize
+    pipeline; any post edit, vote change, or new comment shifts the hash.
+    """
+    posts = db.session.query(
+        db.func.max(Post.updated_at),
+        db.func.count(Post.id),
+        db.func.coalesce(db.func.sum(Post.score), 0),
+    ).one()
+    votes = db.session.query(db.func.count(Vote.id)).scalar()
+    comments = db.session.query(db.func.max(Comment.id)).scalar()
+    # can_edit varies per viewer, so the viewer is part of the key
+    user_id = current_user.id if current_user.is_authenticated else 0
+    payload = f"{posts[0]}|{posts[1]}|{posts[2]}|{votes}|{comments}|{user_id}|{request.full_path}"
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
 
 
 @login_manager.user_loader
@@ -123,6 +269,13 @@ def load_user(user_id):
 
 # Helpers
 HASHTAG_REGEX = re.compile(r"(?<!&)#(\w+)")
+USERNAME_RE = re.compile(r'[A-Za-z0-9_]{3,20}')
+EMAIL_RE = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+')
+
+# Short-TTL per-process caches for the register form's per-keystroke
+# availability checks; stale entries only last until the TTL expires
+username_check_cache = TTLCache(maxsize=4096, ttl=30)
+email_check_cache = TTLCache(maxsize=4096, ttl=30)
 ALLOWED_IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.webp'}
 
 
@@ -132,7 +285,65 @@ def extract_hashtags(text: str) -> set[str]:
     return {m.group(1).lower() for m in HASHTAG_REGEX.finditer(text)}
 
 
-def save_image(file_storage, dest_dir: Path, resize_max: int | None = 1600) -> str:
+def tag_source_hash(title: str, content: str, tags_input: str) -> str:
+    """Fingerprint the fields tags are derived from, so edits that leave them
+    untouched can skip re-extracting and rebuilding the tag list."""
+    payload = f"{title}\n{content}\n{tags_input}".encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def resolve_tags(names: set[str]) -> list[Tag]:
+    """Map tag names to Tag rows, creating missing ones, in two queries total."""
+    names = {n for n in names if n}
+    if not names:
+        return []
+    existing = {t.name: t for t in Tag.query.filter(Tag.name.in_(names)).all()}
+    new_tags = [Tag(name=n) for n in names - existing.keys()]
+    db.session.add_all(new_tags)
+    return [*existing.values(), *new_tags]
+
+
+# Background pool for image processing so uploads don't pin a request worker
+# for the whole decode-resize-encode pipeline
+image_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='image')
+
+
+def process_image(data: bytes, filepath: Path, ext: str, resize_max: int | None):
+    """Decode, resize, and encode an upload to its final path."""
+    image = Image.open(io.BytesIO(data))
+    if image.format == 'JPEG' and resize_max:
+        # Shrink-on-load: let libjpeg decode at the nearest DCT scale (1/2, 1/4, 1/8)
+        # instead of decoding the full image and downscaling afterwards
+        image.draft('RGB', (resize_max, resize_max))
+    if image.mode == 'P':
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+    if image.mode == 'RGBA':
+        # Composite onto white before resizing: a plain convert('RGB') drops
+        # alpha, and resizing unassociated alpha produces halos at the edges
+        image = Image.alpha_composite(Image.new('RGBA', image.size, (255, 255, 255, 255)), image).convert('RGB')
+    if resize_max:
+        image.thumbnail((resize_max, resize_max))
+    if ext in ('.jpg', '.jpeg'):
+        image.save(filepath, 'JPEG', quality=85, optimize=True, progressive=True)
+    elif ext == '.png':
+        image.save(filepath, 'PNG', optimize=True)
+    else:
+        image.save(filepath)
+
+
+def _process_image_job(data: bytes, filepath: Path, ext: str, resize_max: int | None):
+    try:
+        process_image(data, filepath, ext, resize_max)
+    except Exception as e:
+        print(f"Error processing image {filepath.name}: {e}")
+
+
+def save_image(file_storage, dest_dir: Path, resize_max: int | None = 1600, background: bool = False) -> str:
+    """Store an upload and return its URL.
+
+    With background=True the validated bytes are handed to the worker pool and
+    the final URL is returned immediately; the file lands moments later.
+    """
     filename = secure_filename(file_storage.filename)
     ext = Path(filename).suffix.lower()
     if ext not in ALLOWED_IMAGE_EXTENSIONS:
@@ -140,14 +351,39 @@ def save_image(file_storage, dest_dir: Path, resize_max: int | None = 1600) -> s
     random_prefix = secrets.token_hex(8)
     filename = f"{random_prefix}_{filename}"
     filepath = dest_dir / filename
-    image = Image.open(file_storage.stream)
-    image = image.convert('RGB') if image.mode in ('P', 'RGBA') else image
-    if resize_max:
-        image.thumbnail((resize_max, resize_max))
-    image.save(filepath)
+    data = file_storage.stream.read()  # bounded by MAX_CONTENT_LENGTH
+    if background:
+        # Cheap decodability check up front so corrupt uploads fail the
+        # request instead of dying silently on the pool with a dead URL
+        try:
+            Image.open(io.BytesIO(data)).verify()
+        except Exception:
+            raise ValueError('Invalid image file')
+        image_executor.submit(_process_image_job, data, filepath, ext, resize_max)
+    else:
+        process_image(data, filepath, ext, resize_max)
     return f"/static/uploads/{'avatars' if dest_dir == UPLOAD_FOLDER_AVATARS else 'posts'}/{filename}"
 
 
+def attach_vote_counts(posts: list) -> None:
+    """Set upvotes/downvotes on each post with a single GROUP BY query."""
+    if not posts:
+        return
+    rows = (
+        db.session.query(
+            Vote.post_id,
+            db.func.sum(db.case((Vote.value == 1, 1), else_=0)).label('up'),
+            db.func.sum(db.case((Vote.value == -1, 1), else_=0)).label('down'),
+        )
+        .filter(Vote.post_id.in_([p.id for p in posts]))
+        .group_by(Vote.post_id)
+        .all()
+    )
+    counts = {r.post_id: (r.up, r.down) for r in rows}
+    for post in posts:
+        post.upvotes, post.downvotes = counts.get(post.id, (0, 0))
+
+
 # Routes
 
 def register_routes(app: Flask):
@@ -157,80 +393,86 @@ def register_routes(app: Flask):
         per_page = int(request.args.get('per_page', 10))
         q = request.args.get('q', '').strip()
 
-        query = Post.query
+        # The template renders each post's tags; bulk-load them in one SELECT
+        query = Post.query.options(selectinload(Post.tags))
         if q:
-            like = f"%{q}%"
-            query = query.join(User, Post.author).outerjoin(post_tags).outerjoin(Tag)
-            query = query.filter(
-                db.or_(
-                    Post.title.ilike(like),
-                    Post.content.ilike(like),
-                    User.username.ilike(like),
-                    Tag.name.ilike(like),
-                )
-            )
-            query = query.distinct()
-
-        posts = query.all()
-        posts.sort(key=lambda p: (p.score, p.created_at), reverse=True)
+            # FTS5 search: best-ranked page of ids, then one fetch by id
+            ids = search_post_ids(q, per_page, (page - 1) * per_page)
+            by_id = {p.id: p for p in query.filter(Post.id.in_(ids)).all()}
+            page_posts = [by_id[i] for i in ids if i in by_id]
+        else:
+            query = query.order_by(Post.score.desc(), Post.created_at.desc())
+            page_posts = query.limit(per_page).offset((page - 1) * per_page).all()
 
-        start = (page - 1) * per_page
-        end = start + per_page
-        page_posts = posts[start:end]
-        
-        # Calculate vote counts for each post
-        for post in page_posts:
-            post.upvotes = Vote.query.filter_by(post_id=post.id, value=1).count()
-            post.downvotes = Vote.query.filter_by(post_id=post.id, value=-1).count()
+        attach_vote_counts(page_posts)
 
         return render_template('index.html', posts=page_posts)
 
     @app.route('/api/posts')
     def api_posts():
+        etag = feed_etag()
+        if etag in request.if_none_match:
+            # RFC 9110: a 304 repeats the validator it was matched against
+            response = make_response('', 304)
+            response.set_etag(etag)
+            return response
+
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 10))
         q = request.args.get('q', '').strip()
 
-        query = Post.query
+        # Columnar query: fetch exactly the serialized columns as plain tuples,
+        # skipping ORM hydration and per-post relationship loads
+        columns = (Post.id, Post.title, Post.content, Post.image_path, Post.author_id,
+                   User.username, Post.created_at, Post.updated_at, Post.score)
+        base = db.session.query(*columns).join(User, Post.author_id == User.id)
+
         if q:
-            like = f"%{q}%"
-            query = query.join(User, Post.author).outerjoin(post_tags).outerjoin(Tag)
-            query = query.filter(
-                db.or_(
-                    Post.title.ilike(like),
-                    Post.content.ilike(like),
-                    User.username.ilike(like),
-                    Tag.name.ilike(like),
-                )
+            # FTS5 search: best-ranked page of ids, then one fetch by id
+            ids = search_post_ids(q, per_page, (page - 1) * per_page)
+            by_id = {r.id: r for r in base.filter(Post.id.in_(ids)).all()}
+            rows = [by_id[i] for i in ids if i in by_id]
+            total = db.session.execute(
+                db.text('SELECT count(*) FROM post_fts WHERE post_fts MATCH :q'),
+                {'q': fts_match_query(q)},
+            ).scalar() if ids else 0
+        else:
+            total = db.session.query(db.func.count()).select_from(Post).scalar()
+            rows = (base.order_by(Post.score.desc(), Post.created_at.desc())
+                    .limit(per_page).offset((page - 1) * per_page).all())
+
+        # One query for all tags on the page, grouped by post
+        tags_by_post = {}
+        if rows:
+            tag_rows = (
+                db.session.query(post_tags.c.post_id, Tag.name)
+                .join(Tag, Tag.id == post_tags.c.tag_id)
+                .filter(post_tags.c.post_id.in_([r.id for r in rows]))
             )
-            query = query.distinct()
-
-        posts = query.all()
-        posts.sort(key=lambda p: (p.score, p.created_at), reverse=True)
-
-        start = (page - 1) * per_page
-        end = start + per_page
-        page_items = posts[start:end]
-
-        def serialize_post(p: Post):
-            return {
-                'id': p.id,
-                'title': p.title,
-                'content': p.content,
-                'image_url': p.image_path,
-                'author': p.author.username,
-                'author_id': p.author.id,
-                'tags': [t.name for t in p.tags],
-                'created_at': p.created_at.isoformat() + 'Z',
-                'updated_at': p.updated_at.isoformat() + 'Z',
-                'score': p.score,
-                'can_edit': current_user.is_authenticated and current_user.id == p.author_id,
-            }
-
-        return jsonify({
-            'items': [serialize_post(p) for p in page_items],
-            'has_more': end < len(posts),
+            for post_id, name in tag_rows:
+                tags_by_post.setdefault(post_id, []).append(name)
+
+        viewer_id = current_user.id if current_user.is_authenticated else None
+        items = [{
+            'id': r.id,
+            'title': r.title,
+            'content': r.content,
+            'image_url': r.image_path,
+            'author': r.username,
+            'author_id': r.author_id,
+            'tags': tags_by_post.get(r.id, []),
+            'created_at': r.created_at,
+            'updated_at': r.updated_at,
+            'score': r.score,
+            'can_edit': viewer_id == r.author_id,
+        } for r in rows]
+
+        response = jsonify({
+            'items': items,
+            'has_more': page * per_page < total,
         })
+        response.set_etag(etag)
+        return response
 
     @app.route('/register', methods=['GET', 'POST'])
     def register():
@@ -242,15 +484,15 @@ def register_routes(app: Flask):
 
             # Server-side validations
             errors = {}
-            if not re.fullmatch(r'[A-Za-z0-9_]{3,20}', username or ''):
+            if not USERNAME_RE.fullmatch(username or ''):
                 errors['username'] = '3-20 chars, letters/numbers/underscore'
-            if not re.fullmatch(r'[^@\s]+@[^@\s]+\.[^@\s]+', email or ''):
+            if not EMAIL_RE.fullmatch(email or ''):
                 errors['email'] = 'Invalid email'
             if len(password) < 6:
                 errors['password'] = 'At least 6 characters'
-            if User.query.filter_by(username=username).first():
+            if db.session.query(User.id).filter_by(username=username).first() is not None:
                 errors['username'] = 'Username already taken'
-            if User.query.filter_by(email=email).first():
+            if db.session.query(User.id).filter_by(email=email).first() is not None:
                 errors['email'] = 'Email already registered'
             if errors:
                 for k, v in errors.items():
@@ -261,6 +503,8 @@ def register_routes(app: Flask):
             user.set_password(password)
             db.session.add(user)
             db.session.commit()
+            username_check_cache.pop(username, None)
+            email_check_cache.pop(email, None)
             login_user(user)
             return redirect(url_for('index'))
         return render_template('register.html')
@@ -268,15 +512,25 @@ def register_routes(app: Flask):
     @app.get('/api/check_username')
     def check_username():
         username = request.args.get('username', '').strip()
-        valid = bool(re.fullmatch(r'[A-Za-z0-9_]{3,20}', username))
-        available = valid and not User.query.filter_by(username=username).first()
+        valid = bool(USERNAME_RE.fullmatch(username))
+        if not valid:
+            return jsonify({'valid': False, 'available': False})
+        available = username_check_cache.get(username)
+        if available is None:
+            available = db.session.query(User.id).filter_by(username=username).first() is None
+            username_check_cache[username] = available
         return jsonify({'valid': valid, 'available': available})
 
     @app.get('/api/check_email')
     def check_email():
         email = request.args.get('email', '').strip().lower()
-        valid = bool(re.fullmatch(r'[^@\s]+@[^@\s]+\.[^@\s]+', email))
-        available = valid and not User.query.filter_by(email=email).first()
+        valid = bool(EMAIL_RE.fullmatch(email))
+        if not valid:
+            return jsonify({'valid': False, 'available': False})
+        available = email_check_cache.get(email)
+        if available is None:
+            available = db.session.query(User.id).filter_by(email=email).first() is None
+            email_check_cache[email] = available
         return jsonify({'valid': valid, 'available': available})
 
     @app.route('/login', methods=['GET', 'POST'])
@@ -316,11 +570,12 @@ def register_routes(app: Flask):
             image_url = None
             if image and image.filename:
                 try:
-                    image_url = save_image(image, UPLOAD_FOLDER_POSTS)
+                    image_url = save_image(image, UPLOAD_FOLDER_POSTS, background=True)
                 except Exception as e:
                     flash(str(e), 'error')
 
-            post = Post(title=title, content=content, image_path=image_url, author_id=current_user.id)
+            post = Post(title=title, content=content, image_path=image_url, author_id=current_user.id,
+                        content_hash=tag_source_hash(title, content, tags_input))
 
             # Process tags - remove # symbols and avoid duplicates
             tags = set()
@@ -328,21 +583,11 @@ def register_routes(app: Flask):
                 # Clean manually entered tags (remove # symbols and whitespace)
                 manual_tags = set(filter(None, [t.strip().lower().lstrip('#') for t in tags_input.split(',')]))
                 tags.update(manual_tags)
-            
+
             # Extract hashtags from title and content (without # symbols)
-            title_hashtags = extract_hashtags(title)
-            content_hashtags = extract_hashtags(content)
-            tags.update(title_hashtags)
-            tags.update(content_hashtags)
-            
-            # Create or find existing tags
-            for name in tags:
-                if name:  # Ensure name is not empty
-                    existing = Tag.query.filter_by(name=name).first()
-                    if not existing:
-                        existing = Tag(name=name)
-                        db.session.add(existing)
-                    post.tags.append(existing)
+            tags.update(extract_hashtags(title + '\n' + content))
+
+            post.tags = resolve_tags(tags)
 
             db.session.add(post)
             db.session.commit()
@@ -368,36 +613,28 @@ def register_routes(app: Flask):
 
             if image and image.filename:
                 try:
-                    post.image_path = save_image(image, UPLOAD_FOLDER_POSTS)
+                    post.image_path = save_image(image, UPLOAD_FOLDER_POSTS, background=True)
                 except Exception as e:
                     flash(str(e), 'error')
 
             post.title = title
             post.content = content
 
-            # Update tags
-            post.tags.clear()
-            # Process tags - remove # symbols and avoid duplicates
-            tags = set()
-            if tags_input:
-                # Clean manually entered tags (remove # symbols and whitespace)
-                manual_tags = set(filter(None, [t.strip().lower().lstrip('#') for t in tags_input.split(',')]))
-                tags.update(manual_tags)
-            
-            # Extract hashtags from title and content (without # symbols)
-            title_hashtags = extract_hashtags(title)
-            content_hashtags = extract_hashtags(content)
-            tags.update(title_hashtags)
-            tags.update(content_hashtags)
-            
-            # Create or find existing tags
-            for name in tags:
-                if name:  # Ensure name is not empty
-                    existing = Tag.query.filter_by(name=name).first()
-                    if not existing:
-                        existing = Tag(name=name)
-                        db.session.add(existing)
-                    post.tags.append(existing)
+            # Update tags, unless nothing they derive from actually changed
+            new_hash = tag_source_hash(title, content, tags_input)
+            if new_hash != post.content_hash:
+                post.content_hash = new_hash
+                # Process tags - remove # symbols and avoid duplicates
+                tags = set()
+                if tags_input:
+                    # Clean manually entered tags (remove # symbols and whitespace)
+                    manual_tags = set(filter(None, [t.strip().lower().lstrip('#') for t in tags_input.split(',')]))
+                    tags.update(manual_tags)
+
+                # Extract hashtags from title and content (without # symbols)
+                tags.update(extract_hashtags(title + '\n' + content))
+
+                post.tags = resolve_tags(tags)
 
             db.session.commit()
             flash('Post updated', 'success')
@@ -418,37 +655,50 @@ def register_routes(app: Flask):
     @app.post('/post/<int:post_id>/vote')
     @login_required
     def post_vote(post_id: int):
-        post = Post.query.get_or_404(post_id)
-        
-        # Handle both form data and JSON
-        if request.is_json:
-            data = request.get_json()
+        # The vote path never reads the post body; skip loading the TEXT column
+        post = Post.query.options(defer(Post.content)).filter_by(id=post_id).first_or_404()
+
+        # Handle both form data and JSON; parse the body once
+        data = request.get_json(silent=True)
+        if data is not None:
             vote_type = data.get('vote_type')
-            value = 1 if vote_type == 'up' else -1 if vote_type == 'down' else 0
+            value = 1 if vote_type == 'up' else -1 if vote_type == 'down' else None
         else:
             try:
                 value = int(request.form.get('value'))
-                if value not in (1, -1):
-                    raise ValueError
-            except Exception:
-                return jsonify({'error': 'Invalid vote value'}), 400
+            except (TypeError, ValueError):
+                value = None
+        if value not in (1, -1):
+            return jsonify({'error': 'Invalid vote value'}), 400
 
         vote = Vote.query.filter_by(user_id=current_user.id, post_id=post.id).first()
         if vote and vote.value == value:
             # toggle off
             db.session.delete(vote)
+            delta = -value
         else:
             if not vote:
                 vote = Vote(user_id=current_user.id, post_id=post.id, value=value)
                 db.session.add(vote)
+                delta = value
             else:
+                delta = value - vote.value
                 vote.value = value
+        # Keep the denormalized score in sync with a single atomic UPDATE;
+        # pass updated_at through unchanged so the onupdate default doesn't
+        # mark the post as edited just because someone voted
+        Post.query.filter_by(id=post.id).update({
+            Post.score: Post.score + delta,
+            Post.updated_at: Post.updated_at,
+        })
         db.session.commit()
         
-        # Return updated vote counts
-        upvotes = Vote.query.filter_by(post_id=post.id, value=1).count()
-        downvotes = Vote.query.filter_by(post_id=post.id, value=-1).count()
-        return jsonify({'upvotes': upvotes, 'downvotes': downvotes})
+        # Return updated vote counts from one aggregate query
+        up, down = db.session.query(
+            db.func.sum(db.case((Vote.value == 1, 1), else_=0)),
+            db.func.sum(db.case((Vote.value == -1, 1), else_=0)),
+        ).filter(Vote.post_id == post.id).one()
+        return jsonify({'upvotes': int(up or 0), 'downvotes': int(down or 0)})
 
     @app.post('/post/comment')
     @login_required
@@ -459,24 +709,24 @@ def register_routes(app: Flask):
         
         if not post_id or not content:
             return jsonify({'error': 'Missing post_id or content'}), 400
-            
-        post = Post.query.get_or_404(post_id)
+
+        post = Post.query.options(defer(Post.content)).filter_by(id=post_id).first_or_404()
         comment = Comment(content=content, author_id=current_user.id, post_id=post.id)
         db.session.add(comment)
         db.session.commit()
-        return jsonify({'id': comment.id, 'content': comment.content, 'author': current_user.username, 'created_at': comment.created_at.isoformat() + 'Z'})
+        return jsonify({'id': comment.id, 'content': comment.content, 'author': current_user.username, 'created_at': comment.created_at})
 
     @app.post('/post/<int:post_id>/comment')
     @login_required
     def post_comment(post_id: int):
-        post = Post.query.get_or_404(post_id)
+        post = Post.query.options(defer(Post.content)).filter_by(id=post_id).first_or_404()
         content = request.form.get('content', '').strip()
         if not content:
             return jsonify({'error': 'Empty comment'}), 400
         comment = Comment(content=content, author_id=current_user.id, post_id=post.id)
         db.session.add(comment)
         db.session.commit()
-        return jsonify({'id': comment.id, 'content': comment.content, 'author': current_user.username, 'created_at': comment.created_at.isoformat() + 'Z'})
+        return jsonify({'id': comment.id, 'content': comment.content, 'author': current_user.username, 'created_at': comment.created_at})
 
     @app.post('/upload/image')
     @login_required
@@ -485,7 +735,7 @@ def register_routes(app: Flask):
         if not image or not image.filename:
             return jsonify({'error': 'No image provided'}), 400
         try:
-            url = save_image(image, UPLOAD_FOLDER_POSTS)
+            url = save_image(image, UPLOAD_FOLDER_POSTS, background=True)
         except Exception as e:
             return jsonify({'error': str(e)}), 400
         return jsonify({'url': url})
@@ -518,13 +768,11 @@ def register_routes(app: Flask):
     def profile(user_id: int):
         try:
             user = User.query.get_or_404(user_id)
-            posts = Post.query.filter_by(author_id=user.id).order_by(Post.created_at.desc()).limit(20).all()
-            
-            # Calculate vote counts for each post
-            for post in posts:
-                post.upvotes = Vote.query.filter_by(post_id=post.id, value=1).count()
-                post.downvotes = Vote.query.filter_by(post_id=post.id, value=-1).count()
-                
+            posts = (Post.query.options(selectinload(Post.tags))
+                     .filter_by(author_id=user.id).order_by(Post.created_at.desc()).limit(20).all())
+
+            attach_vote_counts(posts)
+
             return render_template('profile.html', user=user, posts=posts)
         except Exception as e:
             # Log the error for debugging